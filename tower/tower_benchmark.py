@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+"""
+Runs tower_reporter.main() end to end against the local Tower stand-in at a
+few job volumes and reports how many API calls and how much time each report
+costs. The report email is delivered to a local SMTP sink and the CSV is
+written to a scratch directory, so nothing leaves the machine.
+
+Usage:
+    python tower_benchmark.py
+    python tower_benchmark.py --jobs 100 10000 --latency 0.05 --repeat 3
+"""
+
+import os, sys, time, shutil, tempfile, argparse
+
+import tower_standin
+
+DEFAULT_JOB_COUNTS = [100, 10000, 100000]
+REPORT_RANGE       = 10
+
+BENCH_INI = """
+[Auth]
+TOWER_ENDPOINT  = http://localhost/
+TOWER_USER      = bench
+TOWER_PASS      = bench
+
+[Report]
+REPORT_RANGE      = %(range)s
+TO_EMAIL          = tower-report@localhost
+FROM_EMAIL        = tower-bench@localhost
+REPORT_CSV_PATH   = %(csv_path)s
+SMTP_PORT         = %(smtp_port)s
+INSTRUMENTATION   = yes
+"""
+
+
+def load_reporter(workdir, smtp_port):
+    """Imports tower_reporter with a throwaway ini, since it reads its config at import time"""
+    with open(os.path.join(workdir, 'tower_reporter.ini'), 'w') as ini:
+        ini.write(BENCH_INI % dict(range=REPORT_RANGE, smtp_port=smtp_port,
+                                   csv_path=os.path.join(workdir, 'tower_report.csv')))
+
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        import tower_reporter
+    finally:
+        os.chdir(cwd)
+    return tower_reporter
+
+
+def run_once(reporter, job_count, latency):
+    """Runs a full report against a fresh stand-in holding job_count jobs"""
+    server = tower_standin.start_standin(job_count=job_count, days=2 * REPORT_RANGE, latency=latency)
+    reporter.TOWER_ENDPOINT = server.endpoint + 'api/v1/'
+    try:
+        start = time.time()
+        reporter.main()
+        return time.time() - start, server.hits
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark tower_reporter against a local Tower stand-in')
+    parser.add_argument('--jobs', type=int, nargs='+', default=DEFAULT_JOB_COUNTS,
+                        help='job volumes to benchmark (default: %s)' % ' '.join(map(str, DEFAULT_JOB_COUNTS)))
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds of delay added to each API request')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per job volume')
+    args = parser.parse_args()
+
+    workdir  = tempfile.mkdtemp(prefix='tower_bench_')
+    sink     = tower_standin.start_smtp_sink()
+    reporter = load_reporter(workdir, sink.port)
+    summary  = []
+
+    try:
+        for job_count in args.jobs:
+            for run in range(args.repeat):
+                sys.stderr.write('\n=== %s jobs, latency %ss, run %s/%s ===\n' % (
+                                 job_count, args.latency, run + 1, args.repeat))
+                wall, hits = run_once(reporter, job_count, args.latency)
+                summary.append((job_count, run + 1, hits, sum(s['bytes'] for s in reporter.API_STATS.values()), wall))
+    finally:
+        sink.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print('%10s %5s %10s %14s %12s' % ('Jobs', 'Run', 'Requests', 'Bytes', 'Wall (s)'))
+    for row in summary:
+        print('%10d %5d %10d %14d %12.3f' % row)
+    print('Emails delivered to sink: %s' % len(sink.messages))
+
+if __name__ == '__main__':
+    main()
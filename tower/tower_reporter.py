@@ -34,7 +34,7 @@ Average Job Run Duration: 64.14 seconds
 
 """
 
-import os, sys, json, datetime, ConfigParser, smtplib, tempfile, csv
+import os, sys, re, json, time, datetime, ConfigParser, smtplib, tempfile, csv
 from email.mime.text import MIMEText
 
 try:
@@ -80,6 +80,63 @@ TWO_PERIODS_AGO  = TWO_PERIODS_AGO.strftime("%Y-%m-%d")
 TO_EMAIL         = config.get('Report', 'TO_EMAIL')
 FROM_EMAIL       = config.get('Report', 'FROM_EMAIL')
 
+if config.has_option('Report', 'INSTRUMENTATION'):
+    INSTRUMENTATION = config.get('Report', 'INSTRUMENTATION').strip().lower() in ('yes', 'true', 'on', '1')
+else:
+    INSTRUMENTATION = False
+
+# Per endpoint request stats and per phase timings, filled in as the report runs
+API_STATS        = {}
+PHASE_TIMES      = []
+
+
+def reset_instrumentation():
+    """Clears any request/phase stats gathered by a previous run"""
+    API_STATS.clear()
+    del PHASE_TIMES[:]
+
+
+def record_request(target, nbytes, elapsed):
+    """Tallies a single API call against its endpoint, ignoring ids and query strings"""
+    endpoint = re.sub(r'/\d+/', '/<id>/', target.split('?')[0])
+    stats    = API_STATS.setdefault(endpoint, dict(requests=0, bytes=0, seconds=0.0))
+
+    stats['requests'] += 1
+    stats['bytes']    += nbytes
+    stats['seconds']  += elapsed
+
+
+def run_phase(name, func, *args, **kwargs):
+    """Runs func and records how long it took under the given phase name"""
+    start = time.time()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        PHASE_TIMES.append((name, time.time() - start))
+
+
+def print_instrumentation(stream=sys.stderr):
+    """Writes the request and phase stats gathered during the run"""
+    stream.write('### Tower API Requests ###\n')
+    stream.write('%-36s %10s %14s %12s %12s\n' % ('Endpoint', 'Requests', 'Bytes', 'Total (s)', 'Avg (ms)'))
+    for endpoint in sorted(API_STATS):
+        stats = API_STATS[endpoint]
+        stream.write('%-36s %10d %14d %12.3f %12.2f\n' % (
+                     endpoint, stats['requests'], stats['bytes'], stats['seconds'],
+                     1000 * stats['seconds'] / stats['requests']))
+
+    stream.write('%-36s %10d %14d %12.3f\n\n' % (
+                 'TOTAL',
+                 sum(s['requests'] for s in API_STATS.values()),
+                 sum(s['bytes'] for s in API_STATS.values()),
+                 sum(s['seconds'] for s in API_STATS.values())))
+
+    stream.write('### Phase Timings ###\n')
+    for name, elapsed in PHASE_TIMES:
+        stream.write('%-36s %12.3f s\n' % (name, elapsed))
+    stream.write('%-36s %12.3f s\n' % ('TOTAL', sum(elapsed for name, elapsed in PHASE_TIMES)))
+
+
 def percentage(part, whole):
     """Get a Percentage in Float format"""
     return float(format(100 * float(part)/float(whole), '.2f'))
@@ -103,7 +160,9 @@ def get_change_metrics(l_month_qty, c_month_qty, total_qty=None):
 
 def get_data(target):
     """Generic helper function to make a get request and return the json dump"""
+    start = time.time()
     r = requests.get(TOWER_ENDPOINT + target, auth=(TOWER_USER, TOWER_PASS), verify=False)
+    record_request(target, len(r.content), time.time() - start)
     if r.status_code != 200:
         sys.exit('Bad Reponse from Tower Endpoint. Error: %s' % r.text)
     return r.json()
@@ -295,15 +354,16 @@ Average Job Run Duration: {avg_duration} seconds
 
 def main():
     """Main function that runs everything else"""
+    reset_instrumentation()
 
-    tower_v, ansible_v, license_limit, host_count = get_static_data()
+    tower_v, ansible_v, license_limit, host_count = run_phase('static_data', get_static_data)
 
     current_month_job_count, job_qty_change, job_pct_change, current_success_count, current_failures_count,\
     success_qty_change, success_pct_change, \
     failure_qty_change, failure_pct_change, gt_50_qty_change, gt_50_pct_change, \
     lt_50_qty_change, lt_50_pct_change, last_month_gt_50pct_success, \
     current_month_gt_50pct_success, current_month_lt_50pct_success, current_avg_duration, \
-    duration_avg_change, duration_pct_change = get_job_data()
+    duration_avg_change, duration_pct_change = run_phase('job_data', get_job_data)
 
     results = dict(
                    date                   = TODAY,
@@ -331,8 +391,11 @@ def main():
                    avg_duration_chg       = duration_avg_change,
                    avg_duration_pct_chg   = duration_pct_change)
 
-    generate_csv(**results)
-    send_email(**results)
+    run_phase('csv', generate_csv, **results)
+    run_phase('email', send_email, **results)
+
+    if INSTRUMENTATION:
+        print_instrumentation()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+"""
+A local stand-in for the parts of the Ansible Tower API that tower_reporter.py
+talks to, plus an SMTP sink to catch the report email. It lets the reporter be
+exercised and measured without touching a production Tower.
+
+Endpoints served (under /api/v1/):
+    config
+    jobs/                           paginated, filters: status, started__gte, started__lte
+    jobs/<id>/job_host_summaries/   paginated
+
+Jobs are generated deterministically from a seed and spread evenly over the
+last DAYS days so both report periods are populated. Query strings may use
+either '&' or ';' as a separator, since the reporter uses both.
+
+Usage:
+    python tower_standin.py --jobs 10000 --days 20 --latency 0.05 --port 8013
+"""
+
+import sys, json, time, random, datetime, argparse, threading
+
+try:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+    from urllib import unquote_plus
+except ImportError:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+    from urllib.parse import unquote_plus
+
+import smtpd, asyncore
+
+API_ROOT          = '/api/v1/'
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE     = 200
+JOB_STATUSES      = ['successful'] * 7 + ['failed'] * 2 + ['canceled']
+
+
+def generate_jobs(job_count, days, seed=0):
+    """Builds job_count fake jobs, newest first, spread over the last `days` days"""
+    rng   = random.Random(seed)
+    now   = datetime.datetime.now().replace(microsecond=0)
+    step  = datetime.timedelta(days=days) // max(job_count, 1)
+    jobs  = []
+
+    for i in range(job_count):
+        job_id  = job_count - i
+        started = now - step * i
+        elapsed = round(rng.uniform(5, 600), 2)
+        jobs.append(dict(
+                         id       = job_id,
+                         url      = '%sjobs/%s/' % (API_ROOT, job_id),
+                         name     = 'standin_job_%s' % job_id,
+                         status   = rng.choice(JOB_STATUSES),
+                         failed   = False,
+                         started  = started.isoformat() + 'Z',
+                         finished = (started + datetime.timedelta(seconds=elapsed)).isoformat() + 'Z',
+                         elapsed  = elapsed))
+        jobs[-1]['failed'] = jobs[-1]['status'] == 'failed'
+
+    return jobs
+
+
+def generate_host_summaries(job_id, seed=0):
+    """Builds a deterministic set of per host results for a single job"""
+    rng        = random.Random('%s-%s' % (seed, job_id))
+    host_count = rng.randint(1, 40)
+    fail_ratio = rng.random()
+
+    return [dict(
+                 id        = job_id * 1000 + n,
+                 job       = job_id,
+                 host_name = 'host%03d.example.com' % n,
+                 failed    = rng.random() < fail_ratio,
+                 changed   = rng.randint(0, 10),
+                 ok        = rng.randint(1, 30))
+            for n in range(host_count)]
+
+
+def parse_query(query):
+    """Splits a query string on '&' or ';' into a flat dict"""
+    params = {}
+    for pair in query.replace(';', '&').split('&'):
+        if not pair:
+            continue
+        key, _, value = pair.partition('=')
+        params[unquote_plus(key)] = unquote_plus(value)
+    return params
+
+
+class TowerStandin(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server holding the fake Tower dataset"""
+    daemon_threads      = True
+    allow_reuse_address = True
+
+    def __init__(self, address, job_count=100, days=20, latency=0.0, seed=0):
+        HTTPServer.__init__(self, address, TowerRequestHandler)
+        self.jobs      = generate_jobs(job_count, days, seed)
+        self.latency   = latency
+        self.seed      = seed
+        self.hits      = 0
+        self.hits_lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        """Base URL to put in TOWER_ENDPOINT"""
+        return 'http://%s:%s/' % self.server_address[:2]
+
+    def config_data(self):
+        """Body for the config endpoint"""
+        return dict(
+                    version         = '2.4.5',
+                    ansible_version = '2.1.0.0',
+                    license_info    = dict(instance_count=10000, current_instances=1800))
+
+    def filter_jobs(self, params):
+        """Applies the status and started__gte/lte filters the reporter uses"""
+        jobs = self.jobs
+        if 'status' in params:
+            jobs = [job for job in jobs if job['status'] == params['status']]
+        if 'started__gte' in params:
+            jobs = [job for job in jobs if job['started'] >= params['started__gte']]
+        if 'started__lte' in params:
+            jobs = [job for job in jobs if job['started'] <= params['started__lte']]
+        return jobs
+
+
+class TowerRequestHandler(BaseHTTPRequestHandler):
+    """Serves the handful of endpoints tower_reporter.py hits"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.hits_lock:
+            self.server.hits += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        path, _, query = self.path.partition('?')
+        params         = parse_query(query)
+
+        if not path.startswith(API_ROOT):
+            return self.send_json(404, dict(detail='Not found'))
+
+        parts = [part for part in path[len(API_ROOT):].split('/') if part]
+
+        if parts == ['config']:
+            return self.send_json(200, self.server.config_data())
+
+        if parts == ['jobs']:
+            return self.send_page(path, params, self.server.filter_jobs(params))
+
+        if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'job_host_summaries' and parts[1].isdigit():
+            job_id = int(parts[1])
+            if not 1 <= job_id <= len(self.server.jobs):
+                return self.send_json(404, dict(detail='Not found'))
+            return self.send_page(path, params, generate_host_summaries(job_id, self.server.seed))
+
+        return self.send_json(404, dict(detail='Not found'))
+
+    def send_page(self, path, params, items):
+        """Slices items the way Tower does, with count/next/previous links"""
+        try:
+            page      = max(int(params.pop('page', 1)), 1)
+            page_size = min(max(int(params.pop('page_size', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            return self.send_json(400, dict(detail='Invalid page'))
+
+        start = (page - 1) * page_size
+        if items and start >= len(items):
+            return self.send_json(404, dict(detail='Invalid page'))
+
+        def link(number):
+            query = ['%s=%s' % (key, value) for key, value in sorted(params.items())]
+            query.extend(['page=%s' % number, 'page_size=%s' % page_size])
+            return '%s?%s' % (path, '&'.join(query))
+
+        self.send_json(200, dict(
+                                 count    = len(items),
+                                 next     = link(page + 1) if start + page_size < len(items) else None,
+                                 previous = link(page - 1) if page > 1 else None,
+                                 results  = items[start:start + page_size]))
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class SMTPSink(smtpd.SMTPServer):
+    """Accepts and keeps any mail sent to it instead of delivering it"""
+
+    def __init__(self, address):
+        smtpd.SMTPServer.__init__(self, address, None)
+        self.messages = []
+
+    @property
+    def port(self):
+        return self.socket.getsockname()[1]
+
+    def process_message(self, peer, mailfrom, rcpttos, data, **kwargs):
+        self.messages.append(dict(mailfrom=mailfrom, rcpttos=rcpttos, data=data))
+
+
+def start_smtp_sink(host='localhost', port=0):
+    """Starts an SMTPSink on a background thread and returns it"""
+    sink   = SMTPSink((host, port))
+    thread = threading.Thread(target=asyncore.loop, kwargs=dict(timeout=0.1, map=None))
+    thread.daemon = True
+    thread.start()
+    return sink
+
+
+def start_standin(host='localhost', port=0, **kwargs):
+    """Starts a TowerStandin on a background thread and returns it"""
+    server = TowerStandin((host, port), **kwargs)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Ansible Tower API')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8013)
+    parser.add_argument('--jobs', type=int, default=100, help='number of jobs to generate')
+    parser.add_argument('--days', type=int, default=20, help='spread jobs over this many past days')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds of delay added to each request')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = TowerStandin((args.host, args.port), job_count=args.jobs, days=args.days,
+                          latency=args.latency, seed=args.seed)
+    sys.stderr.write('Serving %s jobs at %s\n' % (len(server.jobs), server.endpoint))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()